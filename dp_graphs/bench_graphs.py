@@ -0,0 +1,248 @@
+import time
+from heapq import heappop, heappush
+from queue import Queue
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+
+# Notebook (2_dp_graphs.ipynb) versions, over dict-of-sets adj and {(u, v): length} edges.
+def dfs(start, adj):
+    dfs_tree = {}
+    to_visit = [(None, start)]
+
+    while to_visit:
+        u, v = to_visit.pop()
+        if v not in dfs_tree:
+            dfs_tree[v] = u
+            for neighbor in adj[v]:
+                to_visit.append((v, neighbor))
+
+    return dfs_tree
+
+
+def bfs_dists(start, adj):
+    dists = {start: 0}
+
+    to_visit = Queue()
+    to_visit.put(start)
+
+    while not to_visit.empty():
+        v = to_visit.get()
+        for neighbor in adj[v]:
+            if neighbor not in dists:
+                dists[neighbor] = dists[v] + 1
+                to_visit.put(neighbor)
+
+    return dists
+
+
+def dijkstra(start, adj, edges):
+    dists = {}
+    prevs = {}
+
+    to_visit = [(0, start, None)]
+
+    while to_visit:
+        dist, u, prev = heappop(to_visit)
+        if u not in dists:
+            dists[u] = dist
+            prevs[u] = prev
+            for v in adj[u]:
+                heappush(to_visit, (dist + edges[(u, v)], v, u))
+
+    return dists, prevs
+
+
+def bellman_ford(start, nodes, edges):
+    def update(dists, edge):
+        """Returns True if dists was updated."""
+        u, v = edge
+        min_dist = min(dists[v], dists[u] + edges[edge])
+
+        if min_dist == dists[v]:
+            return False
+        else:
+            dists[v] = min_dist
+            return True
+
+    dists = {n: float("inf") for n in nodes}
+    dists[start] = 0
+
+    for _ in range(len(nodes)):
+        updated = False
+        for edge in edges:
+            updated = update(dists, edge) or updated
+
+        if not updated:
+            break
+
+    if updated:
+        raise ValueError("Negative cycle detected!")
+    return dists
+
+
+def dag_shortest_paths(start, nodes, edges):
+    adj = {node: set() for node in nodes}
+    adj_inv = {node: set() for node in nodes}
+    for u, v in edges:
+        adj[u].add(v)
+        adj_inv[v].add(u)
+
+    # Iterative version of the notebook's recursive topo_sort, which overflows the stack
+    # on large graphs.
+    topo = []
+    visited = {start}
+    to_visit = [(start, iter(adj[start]))]
+    while to_visit:
+        u, children = to_visit[-1]
+        for v in children:
+            if v not in visited:
+                visited.add(v)
+                to_visit.append((v, iter(adj[v])))
+                break
+        else:
+            to_visit.pop()
+            topo.append(u)
+    topo.reverse()
+
+    dists = {n: float("inf") for n in nodes}
+    dists[start] = 0
+    for v in topo:
+        for u in adj_inv[v]:
+            dists[v] = min(dists[v], dists[u] + edges[(u, v)])
+
+    return dists
+
+
+def random_edges(
+    n_nodes: int, n_edges: int, dag: bool = False, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Random (src, dst, weights) w/ integer lengths in [1, 100]. No duplicate edges or
+    self-loops. If dag, all edges go from a lower id to a higher id."""
+    rng = np.random.default_rng(seed)
+    src = rng.integers(0, n_nodes, size=n_edges)
+    dst = rng.integers(0, n_nodes, size=n_edges)
+    if dag:
+        src, dst = np.minimum(src, dst), np.maximum(src, dst)
+    keep = src != dst
+    pairs = np.unique(np.stack([src[keep], dst[keep]], axis=1), axis=0)
+    src, dst = pairs[:, 0], pairs[:, 1]
+    weights = rng.integers(1, 101, size=len(src)).astype(np.float64)
+    return src, dst, weights
+
+
+def chain_edges(n_nodes: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Path 0 -> 1 -> ... -> n_nodes-1 w/ integer lengths in [1, 100]. Every shortest path
+    has as many edges as possible, the worst case for level-by-level algorithms."""
+    rng = np.random.default_rng(seed)
+    src = np.arange(n_nodes - 1)
+    weights = rng.integers(1, 101, size=n_nodes - 1).astype(np.float64)
+    return src, src + 1, weights
+
+
+def grid_edges(
+    n_rows: int, n_cols: int, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Grid DAG w/ edges right and down, lengths in [1, 100]. Node (r, c) is r * n_cols + c.
+    Has n_rows + n_cols - 1 topo levels."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(n_rows * n_cols).reshape(n_rows, n_cols)
+    src = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    dst = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    weights = rng.integers(1, 101, size=len(src)).astype(np.float64)
+    return src, dst, weights
+
+
+def to_notebook_graph(
+    src: np.ndarray, dst: np.ndarray, weights: np.ndarray, n_nodes: int
+) -> tuple[list[int], dict[int, set[int]], dict[tuple[int, int], float]]:
+    """Convert edge arrays to the notebook's (nodes, adj, edges) representation."""
+    nodes = list(range(n_nodes))
+    edges = dict(zip(zip(src.tolist(), dst.tolist()), weights.tolist()))
+    adj = {n: set() for n in nodes}
+    for u, v in edges:
+        adj[u].add(v)
+    return nodes, adj, edges
+
+
+def timed(f, *args) -> float:
+    t0 = time.perf_counter()
+    f(*args)
+    return time.perf_counter() - t0
+
+
+def print_times(csr_times: dict[str, float], notebook_times: dict[str, float]) -> None:
+    for name, csr_time in csr_times.items():
+        line = f"    {name:13s} csr {csr_time:9.4f} sec"
+        if name in notebook_times:
+            speedup = notebook_times[name] / csr_time
+            line += f"    notebook {notebook_times[name]:9.4f} sec    {speedup:6.1f}x"
+        print(line)
+
+
+def bench(n_nodes: int, n_edges: int, notebook: bool = True) -> None:
+    src, dst, weights = random_edges(n_nodes, n_edges)
+    dag_src, dag_dst, dag_weights = random_edges(n_nodes, n_edges, dag=True)
+
+    t0 = time.perf_counter()
+    graph = CSRGraph(n_nodes, src, dst, weights)
+    dag = CSRGraph(n_nodes, dag_src, dag_dst, dag_weights)
+    print(f"|V|={n_nodes:<9d} |E|={graph.n_edges:<9d} build {time.perf_counter() - t0:.3f} sec")
+
+    csr_times = {
+        "dfs": timed(graph.dfs, 0),
+        "bfs": timed(graph.bfs, 0),
+        "dijkstra": timed(graph.dijkstra, 0),
+        "bellman_ford": timed(graph.bellman_ford, 0),
+        "dag": timed(dag.dag_shortest_paths, 0),
+    }
+
+    notebook_times = {}
+    if notebook:
+        nodes, adj, edges = to_notebook_graph(src, dst, weights, n_nodes)
+        dag_nodes, _, dag_edges = to_notebook_graph(dag_src, dag_dst, dag_weights, n_nodes)
+        notebook_times = {
+            "dfs": timed(dfs, 0, adj),
+            "bfs": timed(bfs_dists, 0, adj),
+            "dijkstra": timed(dijkstra, 0, adj, edges),
+            "bellman_ford": timed(bellman_ford, 0, nodes, edges),
+            "dag": timed(dag_shortest_paths, 0, dag_nodes, dag_edges),
+        }
+
+    print_times(csr_times, notebook_times)
+
+
+def bench_deep(
+    name: str, n_nodes: int, src: np.ndarray, dst: np.ndarray, weights: np.ndarray
+) -> None:
+    """Deep DAGs, where the random graphs above only have ~50 topo levels and few
+    Bellman-Ford iterations."""
+    graph = CSRGraph(n_nodes, src, dst, weights)
+    _, level_ptr = graph.topo_levels()
+    print(f"{name:13s} |V|={n_nodes:<9d} |E|={graph.n_edges:<9d} levels {len(level_ptr) - 1}")
+    csr_times = {
+        "bellman_ford": timed(graph.bellman_ford, 0),
+        "dag": timed(graph.dag_shortest_paths, 0),
+    }
+    nodes, _, edges = to_notebook_graph(src, dst, weights, n_nodes)
+    notebook_times = {
+        "bellman_ford": timed(bellman_ford, 0, nodes, edges),
+        "dag": timed(dag_shortest_paths, 0, nodes, edges),
+    }
+    print_times(csr_times, notebook_times)
+
+
+if __name__ == "__main__":
+    for n_nodes in (1_000, 10_000, 100_000):
+        bench(n_nodes, 10 * n_nodes)
+
+    # The notebook Bellman-Ford updates dists in place in edge order, and the chain's edges are
+    # in path order, so it finishes in one pass. Any other edge order takes up to |V| passes.
+    bench_deep("chain", 1_000_000, *chain_edges(1_000_000))
+    # Notebook Bellman-Ford takes ~n_rows passes over all edges, so keep the grid smaller.
+    bench_deep("grid", 90_000, *grid_edges(300, 300))
+
+    # Notebook versions take minutes (and gigabytes for the tuple-keyed dicts) at this scale.
+    bench(1_000_000, 5_000_000, notebook=False)
@@ -0,0 +1,350 @@
+from collections import deque
+from collections.abc import Hashable, Iterable
+from heapq import heappop, heappush
+
+import numpy as np
+
+# Levels w/ at most this many nodes are processed one node at a time. On deep, narrow DAGs the
+# fixed cost of a dozen numpy calls per level is much larger than the work in the level.
+SMALL_LEVEL = 32
+
+
+class NegativeCycleError(ValueError):
+    """Raised when a negative cycle is reachable from the start node."""
+
+
+class CSRGraph:
+    """Directed graph stored in compressed sparse row (CSR) format.
+
+    Nodes are integer ids 0..n_nodes-1. The out-edges of node u are
+    indices[indptr[u]:indptr[u+1]], with matching weights[indptr[u]:indptr[u+1]].
+    Node names (e.g. "S", "A", ...) are mapped to ids by node_ids.
+
+    Algorithms return arrays indexed by node id:
+    * dists: inf (float) or -1 (int, for BFS) for unreachable nodes
+    * prevs: -1 for unreachable nodes, the start node points to itself
+
+    The graph itself takes 8 bytes per node and 16 bytes per edge. dfs, bfs, and dijkstra are
+    scalar loops, and while they run they hold Python list copies of the arrays, which take
+    several times more memory (roughly 36 bytes per edge for dfs and bfs, 68 for dijkstra).
+    """
+
+    def __init__(
+        self,
+        n_nodes: int,
+        src: Iterable[int],
+        dst: Iterable[int],
+        weights: Iterable[float] | None = None,
+        names: list[Hashable] | None = None,
+    ) -> None:
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        if weights is None:
+            weights = np.ones(len(src), dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        if not (len(src) == len(dst) == len(weights)):
+            raise ValueError("src, dst, and weights must have the same length.")
+        if len(src) and (min(src.min(), dst.min()) < 0 or max(src.max(), dst.max()) >= n_nodes):
+            raise ValueError(f"Node ids must be in [0, {n_nodes}).")
+        if names is not None and len(names) != n_nodes:
+            raise ValueError(f"Got {len(names)} names for {n_nodes} nodes.")
+
+        # Bucket edges by source node. Stable sort keeps input order within each row.
+        order = np.argsort(src, kind="stable")
+        self.n_nodes = n_nodes
+        self.indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n_nodes), out=self.indptr[1:])
+        self.indices = dst[order]
+        self.weights = weights[order]
+
+        self.names = list(range(n_nodes)) if names is None else list(names)
+        self.node_ids = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def from_adj(cls, adj: dict[Hashable, Iterable[Hashable]]) -> "CSRGraph":
+        """Build an unweighted graph from a dict-of-sets adjacency list."""
+        names = list(adj)
+        node_ids = {name: i for i, name in enumerate(names)}
+        src = [node_ids[u] for u, neighbors in adj.items() for _ in neighbors]
+        dst = [node_ids[v] for neighbors in adj.values() for v in neighbors]
+        return cls(len(names), src, dst, names=names)
+
+    @classmethod
+    def from_edges(
+        cls, edges: dict[tuple[Hashable, Hashable], float], nodes: Iterable[Hashable] | None = None
+    ) -> "CSRGraph":
+        """Build a weighted graph from a {(u, v): length} dict."""
+        if nodes is None:
+            nodes = dict.fromkeys(n for edge in edges for n in edge)
+        names = list(nodes)
+        node_ids = {name: i for i, name in enumerate(names)}
+        src = [node_ids[u] for u, _ in edges]
+        dst = [node_ids[v] for _, v in edges]
+        return cls(len(names), src, dst, list(edges.values()), names=names)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices)
+
+    def dists_to_dict(self, dists: np.ndarray) -> dict[Hashable, float]:
+        """Map reachable node names to their dists."""
+        unreached = -1 if np.issubdtype(dists.dtype, np.integer) else np.inf
+        return {self.names[i]: dists[i].item() for i in np.flatnonzero(dists != unreached)}
+
+    def tree_to_dict(self, prevs: np.ndarray) -> dict[Hashable, Hashable | None]:
+        """Convert a prevs array to the notebook's {node: parent} tree (root maps to None)."""
+        return {
+            self.names[v]: None if u == v else self.names[u]
+            for v, u in enumerate(prevs.tolist())
+            if u != -1
+        }
+
+    def _check_node(self, node: int) -> None:
+        if not 0 <= node < self.n_nodes:
+            raise ValueError(f"Node ids must be in [0, {self.n_nodes}).")
+
+    def dfs(self, start: int) -> np.ndarray:
+        """Iterative DFS, returns the prevs array of the DFS tree.
+
+        Instead of pushing every (node, neighbor) edge like the notebook version, the stack
+        only holds the current path, and next_edge[u] is the next out-edge of u to try. This
+        bounds the stack by |V| instead of |E|, but the list copies of indptr and indices are
+        still O(|E|) while it runs. It is not much faster: DFS has to visit one edge at a time,
+        and the notebook version is already close to that cost in Python.
+        """
+        self._check_node(start)
+        # Indexing numpy arrays one element at a time is much slower than indexing lists.
+        indptr, indices = self.indptr.tolist(), self.indices.tolist()
+        next_edge = indptr[:-1]
+        prevs = [-1] * self.n_nodes
+        prevs[start] = start
+        to_visit = [start]
+
+        while to_visit:
+            u = to_visit[-1]
+            i, end = next_edge[u], indptr[u + 1]
+            while i < end and prevs[indices[i]] != -1:
+                i += 1
+            if i == end:
+                to_visit.pop()
+                continue
+            next_edge[u] = i + 1
+            prevs[indices[i]] = u
+            to_visit.append(indices[i])
+
+        return np.array(prevs, dtype=np.int64)
+
+    def bfs(self, start: int) -> tuple[np.ndarray, np.ndarray]:
+        """BFS on a deque (queue.Queue takes a lock on every put/get). Returns (dists, prevs)."""
+        self._check_node(start)
+        indptr, indices = self.indptr.tolist(), self.indices.tolist()
+        dists = [-1] * self.n_nodes
+        prevs = [-1] * self.n_nodes
+        dists[start] = 0
+        prevs[start] = start
+        to_visit = deque([start])
+
+        while to_visit:
+            u = to_visit.popleft()
+            for v in indices[indptr[u] : indptr[u + 1]]:
+                if dists[v] == -1:
+                    dists[v] = dists[u] + 1
+                    prevs[v] = u
+                    to_visit.append(v)
+
+        return np.array(dists, dtype=np.int64), np.array(prevs, dtype=np.int64)
+
+    def dijkstra(self, start: int) -> tuple[np.ndarray, np.ndarray]:
+        """Dijkstra w/ a binary heap. Returns (dists, prevs).
+
+        An edge is only pushed when it improves the best known dist of its target, and entries
+        that were superseded by a later push are skipped when popped. This bounds the heap by
+        the number of successful relaxations instead of pushing every edge out of every node.
+        """
+        self._check_node(start)
+        if self.n_edges and self.weights.min() < 0:
+            raise ValueError("Dijkstra requires non-negative edge lengths, use bellman_ford.")
+
+        indptr, indices = self.indptr.tolist(), self.indices.tolist()
+        weights = self.weights.tolist()
+        dists = [float("inf")] * self.n_nodes
+        prevs = [-1] * self.n_nodes
+        done = [False] * self.n_nodes
+        dists[start] = 0.0
+        prevs[start] = start
+        to_visit = [(0.0, start)]
+
+        while to_visit:
+            dist, u = heappop(to_visit)
+            if done[u]:
+                continue
+            done[u] = True
+            for i in range(indptr[u], indptr[u + 1]):
+                v = indices[i]
+                new_dist = dist + weights[i]
+                if new_dist < dists[v]:
+                    dists[v] = new_dist
+                    prevs[v] = u
+                    heappush(to_visit, (new_dist, v))
+
+        return np.array(dists, dtype=np.float64), np.array(prevs, dtype=np.int64)
+
+    def bellman_ford(self, start: int) -> tuple[np.ndarray, np.ndarray]:
+        """Bellman-Ford, relaxing edges against the previous iteration's dists. Returns
+        (dists, prevs).
+
+        After k iterations all shortest paths w/ <= k edges are correct. A dist can only change
+        if the dist of one of its predecessors changed in the last iteration, so each iteration
+        only relaxes the out-edges of those nodes. If dists are still changing on the |V|th
+        iteration, there is a negative cycle reachable from start.
+        """
+        self._check_node(start)
+        dists = np.full(self.n_nodes, np.inf)
+        prevs = np.full(self.n_nodes, -1, dtype=np.int64)
+        dists[start] = 0.0
+        prevs[start] = start
+        changed = np.array([start], dtype=np.int64)
+        # Per-target min of this iteration's candidates. Reset only where it was written.
+        best = np.full(self.n_nodes, np.inf)
+
+        for _ in range(self.n_nodes):
+            if len(changed) == 0:
+                return dists, prevs
+
+            if len(changed) <= SMALL_LEVEL:
+                updates = {}
+                for u in changed.tolist():
+                    row = slice(self.indptr[u], self.indptr[u + 1])
+                    for v, w in zip(self.indices[row].tolist(), self.weights[row].tolist()):
+                        dist = dists[u] + w
+                        if dist < dists[v] and (v not in updates or dist < updates[v][0]):
+                            updates[v] = (dist, u)
+                for v, (dist, u) in updates.items():
+                    dists[v] = dist
+                    prevs[v] = u
+                changed = np.array(list(updates), dtype=np.int64)
+                continue
+
+            edges, counts = self._out_edges(changed)
+            src = np.repeat(changed, counts)
+            dst = self.indices[edges]
+            cands = dists[src] + self.weights[edges]
+
+            np.minimum.at(best, dst, cands)
+            # Any edge achieving an improved min is a valid prev.
+            achieved = (cands == best[dst]) & (cands < dists[dst])
+            best[dst] = np.inf
+            dists[dst[achieved]] = cands[achieved]
+            prevs[dst[achieved]] = src[achieved]
+            changed = np.unique(dst[achieved])
+
+        if len(changed):
+            raise NegativeCycleError("Negative cycle detected!")
+        return dists, prevs
+
+    def topo_levels(self) -> tuple[np.ndarray, np.ndarray]:
+        """Kahn's algorithm, one frontier at a time. Returns (order, level_ptr) in CSR form:
+        level k is order[level_ptr[k]:level_ptr[k+1]]. Every edge goes from a lower level to a
+        higher level, so order is a topological order."""
+        in_degree = np.bincount(self.indices, minlength=self.n_nodes)
+        order = np.empty(self.n_nodes, dtype=np.int64)
+        level_ptr = np.empty(self.n_nodes + 1, dtype=np.int64)
+        level_ptr[0] = 0
+        n_levels = n_sorted = 0
+        frontier = np.flatnonzero(in_degree == 0)
+
+        while len(frontier):
+            if len(frontier) <= SMALL_LEVEL:
+                # Stay in Python lists until a level is large again.
+                frontier = frontier.tolist()
+                while frontier and len(frontier) <= SMALL_LEVEL:
+                    next_frontier = []
+                    for u in frontier:
+                        order[n_sorted] = u
+                        n_sorted += 1
+                        for v in self.indices[self.indptr[u] : self.indptr[u + 1]].tolist():
+                            in_degree[v] -= 1
+                            if in_degree[v] == 0:
+                                next_frontier.append(v)
+                    n_levels += 1
+                    level_ptr[n_levels] = n_sorted
+                    frontier = next_frontier
+                frontier = np.array(frontier, dtype=np.int64)
+                continue
+
+            order[n_sorted : n_sorted + len(frontier)] = frontier
+            n_sorted += len(frontier)
+            n_levels += 1
+            level_ptr[n_levels] = n_sorted
+            edges, _ = self._out_edges(frontier)
+            # Only touch the targets of this level, so each level costs O(its out-edges).
+            targets, counts = np.unique(self.indices[edges], return_counts=True)
+            in_degree[targets] -= counts
+            frontier = targets[in_degree[targets] == 0]
+
+        if n_sorted != self.n_nodes:
+            raise ValueError("Graph has a cycle, it cannot be topologically sorted.")
+        return order, level_ptr[: n_levels + 1].copy()
+
+    def topo_sort(self) -> np.ndarray:
+        """Topological order of all nodes."""
+        order, _ = self.topo_levels()
+        return order
+
+    def dag_shortest_paths(self, start: int) -> tuple[np.ndarray, np.ndarray]:
+        """Shortest paths in a DAG by relaxing edges in topological order. Returns (dists, prevs).
+
+        All edges out of one topo level are relaxed at once. Every in-edge of a node comes from
+        a lower level, so its dist is final before its own out-edges are relaxed.
+        """
+        self._check_node(start)
+        dists = np.full(self.n_nodes, np.inf)
+        prevs = np.full(self.n_nodes, -1, dtype=np.int64)
+        dists[start] = 0.0
+        prevs[start] = start
+
+        order, level_ptr = self.topo_levels()
+        large = np.flatnonzero(np.diff(level_ptr) > SMALL_LEVEL)
+        small_start = 0
+        for k in large.tolist():
+            # The small levels since the last large one are relaxed one node at a time. Their
+            # nodes are contiguous in order, which is a topological order.
+            self._relax_in_order(order[small_start : level_ptr[k]], dists, prevs)
+            small_start = level_ptr[k + 1]
+
+            level = order[level_ptr[k] : level_ptr[k + 1]]
+            level = level[dists[level] < np.inf]
+            edges, counts = self._out_edges(level)
+            if len(edges) == 0:
+                continue
+            src = np.repeat(level, counts)
+            dst = self.indices[edges]
+            cands = dists[src] + self.weights[edges]
+            np.minimum.at(dists, dst, cands)
+            achieved = cands == dists[dst]
+            prevs[dst[achieved]] = src[achieved]
+
+        self._relax_in_order(order[small_start:], dists, prevs)
+        return dists, prevs
+
+    def _relax_in_order(self, nodes: np.ndarray, dists: np.ndarray, prevs: np.ndarray) -> None:
+        """Relax the out-edges of nodes one node at a time, in the given order."""
+        # Convert to lists in chunks, so a long run doesn't hold a list of every node at once.
+        for chunk_start in range(0, len(nodes), 4096):
+            for u in nodes[chunk_start : chunk_start + 4096].tolist():
+                if dists[u] == np.inf:
+                    continue
+                row = slice(self.indptr[u], self.indptr[u + 1])
+                for v, w in zip(self.indices[row].tolist(), self.weights[row].tolist()):
+                    if dists[u] + w < dists[v]:
+                        dists[v] = dists[u] + w
+                        prevs[v] = u
+
+    def _out_edges(self, nodes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Edge indices (into indices/weights) of all out-edges of nodes, grouped by node,
+        and the out-degree of each node."""
+        starts = self.indptr[nodes]
+        counts = self.indptr[nodes + 1] - starts
+        # Offset of each edge within its node's row, then shift to the row start.
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(starts, counts) + offsets, counts
@@ -0,0 +1,195 @@
+import unittest
+
+import numpy as np
+
+import bench_graphs
+from csr_graph import CSRGraph, NegativeCycleError
+
+
+# Example graphs from 2_dp_graphs.ipynb.
+UNDIRECTED_ADJ = {
+    "E": {"D", "S"},
+    "D": {"E", "S"},
+    "S": {"E", "D", "C", "A"},
+    "C": {"S", "B"},
+    "A": {"S", "B"},
+    "B": {"C", "A"},
+}
+
+DIJKSTRA_EDGES = {
+    tuple("AB"): 4,
+    tuple("AC"): 2,
+    tuple("BC"): 3,
+    tuple("BD"): 2,
+    tuple("BE"): 3,
+    tuple("CB"): 1,
+    tuple("CE"): 5,
+    tuple("CD"): 4,
+    tuple("ED"): 1,
+}
+
+NEGATIVE_EDGES = {
+    tuple("SA"): 10,
+    tuple("BA"): 1,
+    tuple("BC"): 1,
+    tuple("CD"): 3,
+    tuple("DE"): -1,
+    tuple("FE"): -1,
+    tuple("GF"): 1,
+    tuple("SG"): 8,
+    tuple("FA"): -4,
+    tuple("AE"): 2,
+    tuple("EB"): -2,
+}
+
+DAG_EDGES = {
+    ("S", "A"): 1,
+    ("S", "C"): 2,
+    ("S", "D"): 5,
+    ("A", "B"): 2,
+    ("A", "D"): 5,
+    ("C", "D"): 3,
+    ("B", "D"): 1,
+    ("B", "T"): 4,
+    ("D", "T"): 1,
+}
+
+
+class TestCSRGraph(unittest.TestCase):
+    def test_build(self):
+        graph = CSRGraph(4, [2, 0, 2, 1], [3, 1, 0, 2], [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(graph.indptr.tolist(), [0, 1, 2, 4, 4])
+        self.assertEqual(graph.indices.tolist(), [1, 2, 3, 0])
+        self.assertEqual(graph.weights.tolist(), [2.0, 4.0, 1.0, 3.0])
+
+        with self.assertRaises(ValueError):
+            CSRGraph(2, [0], [2])
+        for names in (["A"], ["A", "B", "C"]):
+            with self.assertRaises(ValueError):
+                CSRGraph(2, [0], [1], names=names)
+
+    def test_start_out_of_range(self):
+        graph = CSRGraph(3, [0], [1])
+        for algorithm in (
+            graph.dfs,
+            graph.bfs,
+            graph.dijkstra,
+            graph.bellman_ford,
+            graph.dag_shortest_paths,
+        ):
+            for start in (-1, 3):
+                with self.assertRaises(ValueError):
+                    algorithm(start)
+
+    def test_dfs(self):
+        graph = CSRGraph.from_adj(UNDIRECTED_ADJ)
+        tree = graph.tree_to_dict(graph.dfs(graph.node_ids["C"]))
+        self.assertEqual(set(tree), set(UNDIRECTED_ADJ))
+        self.assertIsNone(tree["C"])
+        for v, u in tree.items():
+            if u is not None:
+                self.assertIn(v, UNDIRECTED_ADJ[u])
+
+    def test_bfs(self):
+        graph = CSRGraph.from_adj(UNDIRECTED_ADJ)
+        dists, prevs = graph.bfs(graph.node_ids["S"])
+        self.assertEqual(
+            graph.dists_to_dict(dists), bench_graphs.bfs_dists("S", UNDIRECTED_ADJ)
+        )
+        for v, u in enumerate(prevs):
+            if u != v:
+                self.assertEqual(dists[v], dists[u] + 1)
+
+    def test_dijkstra(self):
+        graph = CSRGraph.from_edges(DIJKSTRA_EDGES)
+        dists, prevs = graph.dijkstra(graph.node_ids["A"])
+        self.assertEqual(graph.dists_to_dict(dists), {"A": 0, "B": 3, "C": 2, "D": 5, "E": 6})
+        self.assertEqual(
+            graph.tree_to_dict(prevs), {"A": None, "B": "C", "C": "A", "D": "B", "E": "B"}
+        )
+
+        with self.assertRaises(ValueError):
+            CSRGraph.from_edges(NEGATIVE_EDGES).dijkstra(0)
+
+    def test_bellman_ford(self):
+        graph = CSRGraph.from_edges(NEGATIVE_EDGES)
+        dists, prevs = graph.bellman_ford(graph.node_ids["S"])
+        expected = {"S": 0, "A": 5, "B": 5, "C": 6, "D": 9, "E": 7, "F": 9, "G": 8}
+        self.assertEqual(graph.dists_to_dict(dists), expected)
+        self.assert_shortest_path_tree(graph, dists, prevs)
+
+        negative_cycle = dict(NEGATIVE_EDGES)
+        negative_cycle[tuple("EB")] = -4
+        with self.assertRaises(NegativeCycleError):
+            CSRGraph.from_edges(negative_cycle).bellman_ford(0)
+
+    def test_dag_shortest_paths(self):
+        graph = CSRGraph.from_edges(DAG_EDGES)
+        order = graph.topo_sort()
+        position = np.empty_like(order)
+        position[order] = np.arange(len(order))
+        src = np.repeat(np.arange(graph.n_nodes), np.diff(graph.indptr))
+        self.assertTrue((position[src] < position[graph.indices]).all())
+
+        dists, prevs = graph.dag_shortest_paths(graph.node_ids["S"])
+        expected = {"S": 0, "A": 1, "C": 2, "B": 3, "D": 4, "T": 5}
+        self.assertEqual(graph.dists_to_dict(dists), expected)
+        self.assert_shortest_path_tree(graph, dists, prevs)
+
+        with self.assertRaises(ValueError):
+            CSRGraph(2, [0, 1], [1, 0]).topo_sort()
+
+    def test_long_chain(self):
+        # One node per topo level, so any per-level O(|V|) work makes this quadratic.
+        n_nodes = 200_000
+        src, dst, weights = bench_graphs.chain_edges(n_nodes)
+        graph = CSRGraph(n_nodes, src, dst, weights)
+        _, level_ptr = graph.topo_levels()
+        self.assertEqual(len(level_ptr) - 1, n_nodes)
+
+        expected_dists = np.concatenate([[0], np.cumsum(weights)]).tolist()
+        expected_prevs = [0] + list(range(n_nodes - 1))
+        for dists, prevs in (graph.dag_shortest_paths(0), graph.bellman_ford(0)):
+            self.assertEqual(dists.tolist(), expected_dists)
+            self.assertEqual(prevs.tolist(), expected_prevs)
+
+    def test_random_graphs(self):
+        for seed in range(5):
+            n_nodes = 200
+            src, dst, weights = bench_graphs.random_edges(n_nodes, 1000, seed=seed)
+            graph = CSRGraph(n_nodes, src, dst, weights)
+            nodes, adj, edges = bench_graphs.to_notebook_graph(src, dst, weights, n_nodes)
+
+            dists, _ = graph.bfs(0)
+            self.assertEqual(graph.dists_to_dict(dists), bench_graphs.bfs_dists(0, adj))
+
+            expected, _ = bench_graphs.dijkstra(0, adj, edges)
+            dists, prevs = graph.dijkstra(0)
+            self.assertEqual(graph.dists_to_dict(dists), expected)
+            self.assert_shortest_path_tree(graph, dists, prevs)
+
+            dists, prevs = graph.bellman_ford(0)
+            self.assertEqual(graph.dists_to_dict(dists), expected)
+            self.assert_shortest_path_tree(graph, dists, prevs)
+
+            src, dst, weights = bench_graphs.random_edges(n_nodes, 1000, dag=True, seed=seed)
+            graph = CSRGraph(n_nodes, src, dst, weights)
+            nodes, _, edges = bench_graphs.to_notebook_graph(src, dst, weights, n_nodes)
+            dists, prevs = graph.dag_shortest_paths(0)
+            expected = bench_graphs.dag_shortest_paths(0, nodes, edges)
+            self.assertEqual(dists.tolist(), [expected[n] for n in nodes])
+            self.assert_shortest_path_tree(graph, dists, prevs)
+
+    def assert_shortest_path_tree(self, graph, dists, prevs):
+        """Every reached node's prev is an edge that achieves its dist."""
+        for v, u in enumerate(prevs.tolist()):
+            if u == -1:
+                self.assertEqual(dists[v], np.inf)
+            elif u != v:
+                row = slice(graph.indptr[u], graph.indptr[u + 1])
+                lengths = graph.weights[row][graph.indices[row] == v]
+                self.assertIn(dists[v] - dists[u], lengths.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()